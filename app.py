@@ -62,6 +62,19 @@ app.config['UPLOAD_FOLDER'] = 'uploads'
 # Initialize the app with the extension
 db.init_app(app)
 
+if database_url.startswith('sqlite:'):
+    from sqlalchemy import event
+
+    with app.app_context():
+        @event.listens_for(db.engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            # WAL lets the dashboard read progress while ingest writes, and
+            # synchronous=NORMAL is crash-safe under WAL with far fewer fsyncs
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+
 # Ensure directories exist with proper permissions
 for directory in ['uploads', 'data', 'static/css', 'static/js', 'templates']:
     os.makedirs(directory, mode=0o755, exist_ok=True)
@@ -81,6 +94,10 @@ with app.app_context():
         db.create_all()
         db.session.commit()
         print("✓ Database tables created successfully")
+
+        # create_all() skips indexes on tables that already exist
+        for index in models.EmailRecord.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
         
         # For SQLite databases, ensure schema is up to date
         if database_url.startswith('sqlite:'):
@@ -1,19 +1,102 @@
 import pandas as pd
 import numpy as np
+import csv
+import io
 import json
 import logging
 import os
 import time
 from datetime import datetime
-from sqlalchemy import text
-from models import ProcessingSession, EmailRecord, ProcessingError, Rule, WhitelistDomain, AttachmentKeyword, WhitelistSender
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import Integer, text, update, delete, func, case, cast
+from models import ProcessingSession, EmailRecord, Rule, WhitelistDomain, AttachmentKeyword, WhitelistSender
 from app import db
 from performance_config import config
 from workflow_manager import WorkflowManager
 import re
+from collections import namedtuple, deque, Counter
+from itertools import repeat
+from operator import itemgetter
+from flask import current_app
+
+try:
+    import ahocorasick
+except ImportError:
+    # Optional accelerator - wordlist stages fall back to per-keyword substring checks
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+# Prebuilt matcher over a cached keyword list (automaton is None without pyahocorasick),
+# with the per-keyword fields the scanning loops need laid out as parallel tuples
+KeywordIndex = namedtuple('KeywordIndex', [
+    'automaton', 'direct_indices', 'first_chars',
+    'keyword_lowers', 'match_conditions', 'applies_subject', 'applies_attachment'
+])
+
+# EmailRecord field -> (CSV column, value used when the upload lacks that column)
+RECORD_FIELD_SOURCES = {
+    'sender': ('sender', ''),
+    'subject': ('subject', ''),
+    'recipients': ('recipients', ''),
+    'recipients_email_domain': ('recipients_email_domain', ''),
+    'time': ('_time', None),  # CSV uses '_time' column
+    'attachments': ('attachments', ''),
+    'leaver': ('leaver', ''),
+    'termination_date': ('termination_date', None),
+    'bunit': ('bunit', ''),
+    'department': ('department', ''),
+    'status': ('status', ''),
+    'user_response': ('user_response', ''),
+    'final_outcome': ('final_outcome', ''),
+    'justification': ('justification', ''),
+    'policy_name': ('policy_name', 'Standard')
+}
+
+# CSV columns read by _create_email_records; everything else is skipped by the parser
+CSV_COLS = tuple(column for column, _ in RECORD_FIELD_SOURCES.values())
+
+# Columns with a handful of distinct values repeated on every row
+CSV_CATEGORY_COLS = ('leaver', 'bunit', 'department', 'status', 'policy_name')
+
+# Every ingested column is stored as text, so skip per-chunk type inference; low-variety
+# columns are read as categories so each distinct value is allocated once per chunk
+CSV_DTYPES = {column: 'category' if column in CSV_CATEGORY_COLS else str for column in CSV_COLS}
+
+# CSV date columns parsed once per chunk in _create_email_records
+DATE_COLUMNS = ('_time', 'termination_date')
+
+# strptime formats tried by _parse_datetime (prioritize most likely)
+DATETIME_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S.%f%z',  # ISO 8601 with milliseconds and timezone: 2025-08-04T23:58:20.543+0200
+    '%Y-%m-%dT%H:%M:%S.%f',    # ISO 8601 with milliseconds: 2025-08-04T23:58:20.543
+    '%Y-%m-%dT%H:%M:%S%z',     # ISO 8601 with timezone: 2025-07-21T14:44:19+0200
+    '%Y-%m-%dT%H:%M:%S',       # ISO 8601 format: 2025-07-21T14:44:19
+    '%Y-%m-%d %H:%M:%S.%f',    # Standard with milliseconds: 2025-08-04 23:58:20.543
+    '%Y-%m-%d %H:%M:%S',
+    '%m/%d/%Y %H:%M:%S',
+    '%Y-%m-%d',
+    '%m/%d/%Y',
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y'
+)
+
+# Day-first formats can also match month-first strings, which must keep winning,
+# so they are never used as a per-column shortcut
+DAYFIRST_DATETIME_FORMATS = frozenset(['%d/%m/%Y %H:%M:%S', '%d/%m/%Y'])
+
+# Plain ISO timestamps that pandas parses exactly like the strptime formats in _parse_datetime
+ISO_DATETIME_PATTERN = r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d{1,6})?'
+
+# Attachment cell values meaning "no attachments", and list items that are not file names
+EMPTY_ATTACHMENT_VALUES = frozenset(['nan', 'none', 'null', ''])
+NON_ATTACHMENT_ITEMS = frozenset(['none', 'null', 'nan', '', 'no attachments'])
+
+# Immutable snapshot of an AttachmentKeyword row used by the wordlist stages
+CachedKeyword = namedtuple('CachedKeyword', [
+    'keyword', 'keyword_lower', 'category', 'risk_score', 'applies_to', 'match_condition'
+])
+
 class DataProcessor:
     """Main data processing engine for CSV files with custom wordlist matching"""
 
@@ -28,8 +111,18 @@ class DataProcessor:
         # Cache keywords to avoid repeated DB queries
         self._risk_keywords_cache = None
         self._exclusion_keywords_cache = None
+        # KeywordIndex matchers over the cached keywords (None when a list is empty)
+        self._risk_keyword_index = None
+        self._exclusion_keyword_index = None
+        # Compiled per-field regex alternations used as a vectorized prefilter
+        self._risk_subject_re = None
+        self._risk_attachment_re = None
         # Cache for datetime parsing optimization
         self._datetime_format_cache = {}
+        # Last successful format per CSV date column
+        self._datetime_column_formats = {}
+        # Compiled positional INSERT per (dialect, record field order)
+        self._insert_statements = {}
         # Now log after all attributes are initialized
         self.logger.info(f"DataProcessor initialized with config: {self._get_config_summary()}")
         logger.info(f"DataProcessor initialized with config: {config.__dict__}")
@@ -45,9 +138,10 @@ class DataProcessor:
 
     def _matches_condition(self, text, keyword, match_condition):
         """Check if text matches keyword based on the specified condition"""
-        text_lower = text.lower()
-        keyword_lower = keyword.lower()
+        return self._matches_lowered(text.lower(), keyword.lower(), match_condition)
 
+    def _matches_lowered(self, text_lower, keyword_lower, match_condition):
+        """Check an already lower-cased text against an already lower-cased keyword"""
         if match_condition == 'equals':
             return text_lower == keyword_lower
         elif match_condition == 'starts_with':
@@ -78,54 +172,63 @@ class DataProcessor:
             session.error_message = None
             self._commit_with_retry()
 
+            # A run that died before its first progress commit still left its chunks behind
+            removed = self._delete_records_from(session_id, 0)
+            if removed:
+                logger.info(f"Removed {removed} records left by an interrupted run of session {session_id}")
+
+            # Snapshot wordlists once for this session
+            self._load_wordlists()
+
             # Initialize 8-stage workflow
             self.workflow_manager.initialize_workflow(session_id)
 
             # Stage 1: Data Ingestion (0-5%)
             self.workflow_manager.start_stage(session_id, 1)
 
-            # Count total records first with validation
-            total_records = self._count_csv_records_with_validation(file_path)
-            session.total_records = total_records
-            self._commit_with_retry()
-
-            logger.info(f"Processing {total_records} records in chunks of {self.chunk_size}")
-
             processed_count = 0
             current_chunk = 0
+            total_records = None
+            last_progress_commit = time.monotonic()
 
-            # Process file in chunks with enhanced error handling
-            try:
-                for chunk_df in pd.read_csv(file_path, chunksize=self.chunk_size):
-                    current_chunk += 1
-
-                    # Process chunk with retry mechanism
-                    chunk_processed = self._process_chunk_with_retry(session_id, chunk_df, processed_count, current_chunk)
-                    processed_count += chunk_processed
-
-                    # Update session less frequently for better performance
-                    if current_chunk % 2 == 0 or processed_count >= total_records:
-                        session = self._get_session_with_retry(session_id)
-                        session.current_chunk = current_chunk
-                        session.total_chunks = (total_records // self.chunk_size) + 1
-                        session.processed_records = processed_count
-
-                        # Update progress within Data Ingestion stage (0-5%)
-                        progress = min(100, (processed_count / total_records) * 100) if total_records > 0 else 100
-                        self.workflow_manager.update_stage_progress(session_id, 1, progress)
-
-                        self._commit_with_retry()
+            logger.info(f"Processing records in chunks of {self.chunk_size}")
 
-                    logger.info(f"Processed chunk {current_chunk}: {processed_count}/{total_records} records")
-
-                    # Yield control less frequently for better performance
-                    if current_chunk % 10 == 0:
-                        import time
-                        time.sleep(0.05)
+            # Count records on a helper thread while the first chunks ingest; the count
+            # only drives the progress estimate, the ingested total is the real one
+            count_executor = ThreadPoolExecutor(max_workers=1)
+            try:
+                count_future = count_executor.submit(self._count_csv_records_with_validation, file_path)
 
-            except Exception as chunk_error:
-                logger.error(f"Error processing chunks: {str(chunk_error)}")
-                raise Exception(f"Data ingestion failed at chunk {current_chunk}: {str(chunk_error)}")
+                # Process file in chunks with enhanced error handling
+                try:
+                    chunk_iterator = self._read_csv_chunks(file_path)
+                    for current_chunk, chunk_processed in self._ingest_chunks(session_id, chunk_iterator, processed_count, current_chunk):
+                        processed_count += chunk_processed
+                        if count_future is not None and count_future.done():
+                            try:
+                                total_records = count_future.result()
+                            except Exception as count_error:
+                                # Advisory only: without a count the progress bar waits for the final total
+                                logger.warning(f"Could not count CSV records for progress: {count_error}")
+                            count_future = None
+
+                        # Commit progress on a time interval rather than per chunk
+                        now = time.monotonic()
+                        if now - last_progress_commit >= self.config.progress_commit_seconds:
+                            last_progress_commit = now
+                            self._save_ingest_progress(session_id, current_chunk, processed_count, total_records)
+
+                        logger.info(f"Processed chunk {current_chunk}: {processed_count}/{total_records or '?'} records")
+
+                except Exception as chunk_error:
+                    logger.error(f"Error processing chunks: {str(chunk_error)}")
+                    self._flush_ingest_progress(session_id, current_chunk, processed_count)
+                    raise Exception(f"Data ingestion failed at chunk {current_chunk}: {str(chunk_error)}")
+            finally:
+                count_executor.shutdown(wait=False, cancel_futures=True)
+
+            total_records = processed_count
+            self._save_ingest_progress(session_id, current_chunk, processed_count, total_records)
 
             # Complete Data Ingestion
             self.workflow_manager.complete_stage(session_id, 1)
@@ -135,9 +238,8 @@ class DataProcessor:
             self._apply_9_stage_workflow(session_id)
 
             # Final completion
-            session = self._get_session_with_retry(session_id)
-            session.processed_records = processed_count
-            session.status = 'completed'
+            # Patch the final counters in place instead of reloading the session row
+            self._update_session_progress(session_id, processed_records=processed_count, status='completed')
             self._commit_with_retry()
 
             logger.info(f"8-stage CSV processing completed for session {session_id}: {processed_count} records")
@@ -145,6 +247,8 @@ class DataProcessor:
         except Exception as e:
             logger.error(f"Error processing CSV for session {session_id}: {str(e)}")
             try:
+                # Discard any failed transaction first, otherwise the error state is lost with it
+                db.session.rollback()
                 if not session:
                     session = self._get_session_with_retry(session_id)
 
@@ -154,8 +258,11 @@ class DataProcessor:
                         error_msg = f"Stage {session.current_stage} failed: {str(e)}"
                         self.workflow_manager.error_stage(session_id, session.current_stage, error_msg)
                     else:
-                        session.status = 'error'
-                        session.error_message = f"Processing failed: {str(e)}"
+                        self._update_session_progress(
+                            session_id,
+                            status='error',
+                            error_message=f"Processing failed: {str(e)}"
+                        )
                     self._commit_with_retry()
             except Exception as error_handling_exception:
                 logger.error(f"Failed to handle error properly: {str(error_handling_exception)}")
@@ -170,12 +277,60 @@ class DataProcessor:
             except Exception as e:
                 logger.warning(f"Database connection attempt {attempt + 1} failed: {str(e)}")
                 if attempt < max_retries - 1:
-                    import time
                     time.sleep(1)
                     continue
                 else:
                     raise Exception(f"Failed to connect to database after {max_retries} attempts")
 
+    def _update_session_progress(self, session_id, **values):
+        """Patch session progress columns with a single UPDATE instead of load-modify-flush"""
+        db.session.execute(
+            update(ProcessingSession)
+            .where(ProcessingSession.id == session_id)
+            .values(**values)
+        )
+
+    def _relax_progress_commit(self):
+        """Let a progress-only transaction commit without waiting on the WAL flush"""
+        if db.engine.dialect.name == 'postgresql':
+            # A lost progress counter is harmless; status and result writes must not use this
+            db.session.execute(text("SET LOCAL synchronous_commit TO OFF"))
+
+    def _save_ingest_progress(self, session_id, current_chunk, processed_records, total_records=None):
+        """Write chunk progress and the Data Ingestion stage percentage"""
+        self._relax_progress_commit()
+        values = {'current_chunk': current_chunk, 'processed_records': processed_records}
+        if total_records is not None:
+            values['total_records'] = total_records
+            values['total_chunks'] = (total_records // self.chunk_size) + 1
+        self._update_session_progress(session_id, **values)
+
+        # Update progress within Data Ingestion stage (0-5%); unknown until the count lands
+        if total_records is not None:
+            progress = min(100, (processed_records / total_records) * 100) if total_records > 0 else 100
+            self.workflow_manager.update_stage_progress(session_id, 1, progress)
+
+        self._commit_with_retry()
+
+    def _flush_ingest_progress(self, session_id, current_chunk, processed_records):
+        """Persist the last chunk ingested in file order as the resume point
+
+        Chunks committed past it (parallel writers, or a progress commit that
+        lagged) are deleted by _resume_processing before it re-reads the file.
+        """
+        try:
+            db.session.rollback()
+            self._relax_progress_commit()
+            self._update_session_progress(
+                session_id,
+                current_chunk=current_chunk,
+                processed_records=processed_records
+            )
+            db.session.commit()
+        except Exception as e:
+            logger.error(f"Failed to save ingest progress for session {session_id}: {str(e)}")
+            db.session.rollback()
+
     def _commit_with_retry(self, max_retries=3):
         """Commit database changes with retry mechanism"""
         for attempt in range(max_retries):
@@ -186,7 +341,6 @@ class DataProcessor:
                 logger.warning(f"Database commit attempt {attempt + 1} failed: {str(e)}")
                 db.session.rollback()
                 if attempt < max_retries - 1:
-                    import time
                     time.sleep(1)
                     continue
                 else:
@@ -199,19 +353,48 @@ class DataProcessor:
             if not os.path.exists(file_path):
                 raise Exception(f"File not found: {file_path}")
 
-            # Count records efficiently
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return sum(1 for line in f) - 1  # Subtract header
+            # Quoted fields may contain newlines; only a real CSV parse counts those correctly
+            try:
+                if not self.config.fast_row_count or self._sample_has_quoted_newlines(file_path):
+                    with open(file_path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+                        return sum(1 for row in csv.reader(f) if row) - 1  # Subtract header
+            except csv.Error as e:
+                # pandas still reads what the csv module rejects (e.g. fields over its
+                # size limit), so settle for the newline count rather than failing
+                logger.warning(f"CSV parse count failed, counting lines instead: {e}")
+
+            # Count newlines over 1 MiB binary blocks (C-level scan, no decoding)
+            line_count = 0
+            last_byte = b'\n'
+            with open(file_path, 'rb') as f:
+                while True:
+                    block = f.read(1 << 20)
+                    if not block:
+                        break
+                    line_count += block.count(b'\n')
+                    last_byte = block[-1:]
+
+            # A final line without a trailing newline is still a record
+            if last_byte != b'\n':
+                line_count += 1
+            return line_count - 1  # Subtract header
 
         except Exception as e:
-            logger.warning(f"Could not count CSV records efficiently: {e}")
-            try:
-                # Fallback to pandas with validation
-                df = pd.read_csv(file_path, nrows=0)  # Just read header first
-                df = pd.read_csv(file_path)  # Then read full file
-                return len(df)
-            except Exception as pandas_error:
-                raise Exception(f"Failed to read CSV file: {str(pandas_error)}")
+            logger.warning(f"Could not count CSV records: {e}")
+            raise Exception(f"Failed to read CSV file: {str(e)}")
+
+    def _sample_has_quoted_newlines(self, file_path, sample_size=1 << 16):
+        """Check whether the first 64 KiB contain newlines inside quoted fields"""
+        with open(file_path, 'rb') as f:
+            sample = f.read(sample_size)
+        if b'"' not in sample:
+            return False
+
+        # Only compare complete lines; the sample may end mid-record
+        sample = sample[:sample.rfind(b'\n') + 1]
+        text_sample = sample.decode('utf-8', errors='replace')
+        parsed_rows = sum(1 for _ in csv.reader(io.StringIO(text_sample, newline='')))
+        return parsed_rows != sample.count(b'\n')
 
     def _process_chunk_with_retry(self, session_id, chunk_df, start_index, chunk_number, max_retries=3):
         """Process a chunk with retry mechanism"""
@@ -221,13 +404,72 @@ class DataProcessor:
             except Exception as e:
                 logger.warning(f"Chunk {chunk_number} processing attempt {attempt + 1} failed: {str(e)}")
                 if attempt < max_retries - 1:
-                    import time
                     time.sleep(2)
                     db.session.rollback()  # Rollback failed transaction
                     continue
                 else:
                     raise Exception(f"Failed to process chunk {chunk_number} after {max_retries} attempts: {str(e)}")
 
+    def _get_ingest_worker_count(self):
+        """Number of parallel chunk writers; SQLite serializes writers so it always gets one"""
+        workers = max(1, self.config.ingest_workers)
+        if workers > 1 and db.engine.dialect.name == 'sqlite':
+            return 1
+        return workers
+
+    def _ingest_chunks(self, session_id, chunk_iterator, start_index, start_chunk):
+        """Ingest chunks, yielding (chunk_number, processed_count) in file order"""
+        workers = self._get_ingest_worker_count()
+        chunk_number = start_chunk
+        next_index = start_index
+
+        if workers == 1:
+            for chunk_df in self._prefetch_chunks(chunk_iterator):
+                chunk_number += 1
+                yield chunk_number, self._process_chunk_with_retry(session_id, chunk_df, next_index, chunk_number)
+                next_index += len(chunk_df)
+            return
+
+        # Each worker pushes its own app context and so gets its own DB session/connection
+        app = current_app._get_current_object()
+
+        def ingest(chunk_df, chunk_start, number):
+            with app.app_context():
+                return self._process_chunk_with_retry(session_id, chunk_df, chunk_start, number)
+
+        # Bounded in-flight window gives backpressure on the CSV reader
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for chunk_df in chunk_iterator:
+                    chunk_number += 1
+                    pending.append((chunk_number, executor.submit(ingest, chunk_df, next_index, chunk_number)))
+                    next_index += len(chunk_df)
+
+                    if len(pending) >= workers * 2:
+                        number, future = pending.popleft()
+                        yield number, future.result()
+
+                while pending:
+                    number, future = pending.popleft()
+                    yield number, future.result()
+            except BaseException:
+                # Don't start chunks queued behind a failure; ones already running still
+                # commit past the recorded position, which a resume clears first
+                executor.shutdown(cancel_futures=True)
+                raise
+
+    def _prefetch_chunks(self, chunk_iterator):
+        """Parse the next chunk on a helper thread while the current one is being inserted"""
+        with ThreadPoolExecutor(max_workers=1) as reader:
+            future = reader.submit(next, chunk_iterator, None)
+            while True:
+                chunk_df = future.result()
+                if chunk_df is None:
+                    return
+                future = reader.submit(next, chunk_iterator, None)
+                yield chunk_df
+
     def _resume_processing(self, session_id, file_path):
         """Resume processing from where it left off"""
         try:
@@ -237,6 +479,9 @@ class DataProcessor:
             if not session:
                 raise Exception(f"Session {session_id} not found for resume")
 
+            # Snapshot wordlists once for the resumed session
+            self._load_wordlists()
+
             # Get current processing state
             processed_records = session.processed_records or 0
             total_records = session.total_records or self._count_csv_records_with_validation(file_path)
@@ -253,35 +498,31 @@ class DataProcessor:
 
             logger.info(f"Resuming from record {processed_records}, chunk {current_chunk}")
 
-            # Skip to the correct position in file
-            chunk_iterator = pd.read_csv(file_path, chunksize=self.chunk_size)
+            # Let the parser skip already processed chunks instead of parsing and discarding them
+            skip_rows = current_chunk * self.chunk_size
+            chunk_iterator = self._read_csv_chunks(file_path, skip_rows=skip_rows)
 
-            # Skip already processed chunks
-            for i in range(current_chunk):
-                try:
-                    next(chunk_iterator)
-                except StopIteration:
-                    break
+            # Chunks may have committed past the recorded position; clear them so they are not duplicated
+            removed = self._delete_records_from(session_id, skip_rows + processed_records)
+            if removed:
+                logger.info(f"Removed {removed} records ingested past the resume point")
 
             # Continue processing from current position
-            for chunk_df in chunk_iterator:
-                current_chunk += 1
-
-                chunk_processed = self._process_chunk_with_retry(session_id, chunk_df, processed_records, current_chunk)
-                processed_records += chunk_processed
-
-                # Update session
-                session = self._get_session_with_retry(session_id)
-                session.current_chunk = current_chunk
-                session.processed_records = processed_records
-
-                # Update progress
-                progress = min(100, (processed_records / total_records) * 100) if total_records > 0 else 100
-                self.workflow_manager.update_stage_progress(session_id, 1, progress)
+            last_progress_commit = time.monotonic()
+            try:
+                for current_chunk, chunk_processed in self._ingest_chunks(session_id, chunk_iterator, processed_records, current_chunk):
+                    processed_records += chunk_processed
 
-                self._commit_with_retry()
+                    # Commit progress on a time interval rather than per chunk
+                    now = time.monotonic()
+                    if processed_records >= total_records or now - last_progress_commit >= self.config.progress_commit_seconds:
+                        last_progress_commit = now
+                        self._save_ingest_progress(session_id, current_chunk, processed_records)
 
-                logger.info(f"Resumed chunk {current_chunk}: {processed_records}/{total_records} records")
+                    logger.info(f"Resumed chunk {current_chunk}: {processed_records}/{total_records} records")
+            except Exception:
+                self._flush_ingest_progress(session_id, current_chunk, processed_records)
+                raise
 
             # Complete data ingestion and continue with workflow
             self.workflow_manager.complete_stage(session_id, 1)
@@ -293,6 +534,35 @@ class DataProcessor:
             logger.error(f"Error resuming processing: {str(e)}")
             raise
 
+    def _delete_records_from(self, session_id, first_record):
+        """Delete a session's records numbered first_record and above"""
+        # Record ids are 'record_<row index + chunk start index>', which grows along the file
+        record_number = cast(func.substr(EmailRecord.record_id, len('record_') + 1), Integer)
+        result = db.session.execute(
+            delete(EmailRecord)
+            .where(EmailRecord.session_id == session_id, record_number >= first_record)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount
+
+    def _read_csv_chunks(self, file_path, skip_rows=0):
+        """Iterate the CSV in chunks, parsing only the ingested columns as strings"""
+        # The pyarrow engine does not support chunksize, so stay on the C parser
+        reader = pd.read_csv(
+            file_path,
+            chunksize=self.chunk_size,
+            usecols=lambda column: column in CSV_DTYPES,
+            dtype=CSV_DTYPES,
+            engine='c',
+            skiprows=range(1, skip_rows + 1) if skip_rows else None  # Keep the header line
+        )
+        if not skip_rows:
+            return reader
+
+        # Shift the index back to file positions so record ids match an unskipped read
+        return (chunk_df.set_axis(chunk_df.index + skip_rows) for chunk_df in reader)
+
     def _count_csv_records(self, file_path):
         """Count total records in CSV file (legacy method)"""
         return self._count_csv_records_with_validation(file_path)
@@ -300,29 +570,13 @@ class DataProcessor:
     def _process_chunk(self, session_id, chunk_df, start_index):
         """Process a chunk of data with custom wordlist matching"""
         try:
-            records_to_add = []
-
-            for idx, row in chunk_df.iterrows():
-                try:
-                    # Create email record with custom wordlist analysis
-                    record = self._create_email_record(session_id, row, start_index + idx)
-                    records_to_add.append(record)
-
-                    # Batch commit for performance
-                    if len(records_to_add) >= self.batch_commit_size:
-                        db.session.add_all(records_to_add)
-                        db.session.commit()
-                        records_to_add = []
-
-                except Exception as e:
-                    logger.warning(f"Error processing record at index {idx}: {str(e)}")
-                    self._log_processing_error(session_id, 'record_processing', str(e), row.to_dict())
-                    continue
+            # Build every record of the chunk with column-wise operations
+            fields, rows = self._create_email_records(session_id, chunk_df, start_index)
 
-            # Commit remaining records
-            if records_to_add:
-                db.session.add_all(records_to_add)
-                db.session.commit()
+            # One bulk statement and one commit per chunk, so a retried chunk never
+            # re-inserts rows from an earlier partial commit
+            self._insert_email_records(fields, rows)
+            db.session.commit()
 
             return len(chunk_df)
 
@@ -331,102 +585,309 @@ class DataProcessor:
             db.session.rollback()
             raise
 
-    def _create_email_record(self, session_id, row, record_index):
-        """Create email record with custom wordlist analysis"""
-        # Extract basic fields using correct CSV column names
-        record_data = {
-            'session_id': session_id,
-            'record_id': f'record_{record_index}',  # Generate record ID since CSV doesn't have one
-            'sender': str(row.get('sender', '')),
-            'subject': str(row.get('subject', '')),
-            'recipients': str(row.get('recipients', '')),
-            'recipients_email_domain': str(row.get('recipients_email_domain', '')),
-            'time': self._parse_datetime(row.get('_time')),  # CSV uses '_time' column
-            'attachments': str(row.get('attachments', '')),
-            'leaver': str(row.get('leaver', '')),
-            'termination_date': self._parse_datetime(row.get('termination_date')),
-            'bunit': str(row.get('bunit', '')),
-            'department': str(row.get('department', '')),
-            'status': str(row.get('status', '')),
-            'user_response': str(row.get('user_response', '')),
-            'final_outcome': str(row.get('final_outcome', '')),
-            'justification': str(row.get('justification', '')),
-            'policy_name': str(row.get('policy_name', 'Standard'))
-        }
+    def _create_email_records(self, session_id, chunk_df, start_index):
+        """Build a chunk's records as (fields, row tuples), converting each column once"""
+        row_count = len(chunk_df)
+
+        # Generate record IDs since CSV doesn't have one
+        fields = ['session_id', 'record_id']
+        columns = [
+            repeat(session_id, row_count),
+            ('record_' + (chunk_df.index + start_index).astype(str)).tolist()
+        ]
+
+        for field, (column, default) in RECORD_FIELD_SOURCES.items():
+            fields.append(field)
+            if column not in chunk_df.columns:
+                columns.append(repeat(default, row_count))
+            elif column in DATE_COLUMNS:
+                columns.append(self._parse_datetime_column(chunk_df[column]).tolist())
+            else:
+                # astype(str) matches the old per-cell str() (NaN -> 'nan'); category
+                # columns expand to shared references to their few category strings
+                columns.append(chunk_df[column].astype(str).tolist())
 
         # Skip wordlist analysis during data ingestion for speed
         # This will be done in Stage 5 (Wordlist Analysis) instead
-        # No additional fields needed - using existing model fields
-
-        return EmailRecord(**record_data)
+        return fields, list(zip(*columns))
+
+    def _insert_email_records(self, fields, rows):
+        """Insert record rows in bulk (COPY on psycopg2, precompiled DBAPI executemany on positional drivers)"""
+        if not rows:
+            return
+        dialect = db.engine.dialect
+        if dialect.name == 'postgresql' and dialect.driver == 'psycopg2':
+            self._copy_email_records(fields, rows)
+            return
+
+        statement = self._compiled_insert(dialect, tuple(fields)) if dialect.positional else None
+        if statement is None:
+            db.session.execute(EmailRecord.__table__.insert(), [dict(zip(fields, row)) for row in rows])
+            return
+
+        # Reuse the compiled SQL and feed the DBAPI positional tuples directly
+        sql, arrange, defaults = statement
+        cursor = db.session.connection().connection.cursor()
+        try:
+            cursor.executemany(sql, [arrange(row + defaults) for row in rows])
+        finally:
+            cursor.close()
+
+    def _compiled_insert(self, dialect, fields):
+        """Compile the email record INSERT once per field layout for positional-paramstyle drivers"""
+        key = (dialect.name, dialect.driver, fields)
+        if key not in self._insert_statements:
+            table = EmailRecord.__table__
+
+            def bind_processor(name):
+                return table.c[name].type.dialect_impl(dialect).bind_processor(dialect)
+
+            # Raw executemany bypasses SQLAlchemy column defaults, so bind the scalar ones explicitly
+            defaults = {}
+            for column in table.columns:
+                if column.name not in fields and column.default is not None and column.default.is_scalar:
+                    process = bind_processor(column.name)
+                    defaults[column.name] = process(column.default.arg) if process else column.default.arg
+
+            statement = None
+            compiled = table.insert().compile(dialect=dialect, column_keys=list(fields) + list(defaults))
+            sources = list(fields) + list(defaults)
+            positions = compiled.positiontup or []
+
+            # Only values that need no driver-side conversion can skip SQLAlchemy's bind processing
+            if len(sources) > 1 and sorted(positions) == sorted(sources) \
+                    and not any(bind_processor(name) for name in fields):
+                arrange = itemgetter(*[sources.index(name) for name in positions])
+                statement = (str(compiled), arrange, tuple(defaults.values()))
+            self._insert_statements[key] = statement
+        return self._insert_statements[key]
+
+    def _copy_email_records(self, fields, rows):
+        """Stream record rows through PostgreSQL COPY FROM STDIN in the session's transaction"""
+        table = EmailRecord.__table__
+
+        # COPY bypasses SQLAlchemy column defaults, so send the scalar ones explicitly
+        default_columns = [
+            column for column in table.columns
+            if column.name not in fields and column.default is not None and column.default.is_scalar
+        ]
+        default_text = [self._copy_text_value(column.default.arg) for column in default_columns]
+
+        buffer = io.StringIO()
+        encode = self._copy_text_value
+        for row in rows:
+            buffer.write('\t'.join([encode(value) for value in row] + default_text))
+            buffer.write('\n')
+        buffer.seek(0)
+
+        quote = db.engine.dialect.identifier_preparer.quote
+        column_list = ', '.join(quote(name) for name in list(fields) + [column.name for column in default_columns])
+        cursor = db.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {quote(table.name)} ({column_list}) FROM STDIN WITH (FORMAT text)", buffer)
+        finally:
+            cursor.close()
+
+    def _copy_text_value(self, value):
+        """Encode one value for COPY text format"""
+        if value is None:
+            return '\\N'
+        if isinstance(value, bool):
+            return 't' if value else 'f'
+        # Datetimes land in string columns, so store them the way str() renders them
+        encoded = str(value)
+        return encoded.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+    def _load_wordlists(self):
+        """Snapshot active risk and exclusion keywords as plain tuples for the current session"""
+        def snapshot(keyword_type):
+            keywords = AttachmentKeyword.query.filter_by(
+                is_active=True,
+                keyword_type=keyword_type
+            ).all()
+            return [
+                CachedKeyword(
+                    keyword=kw.keyword,
+                    keyword_lower=kw.keyword.lower(),
+                    category=kw.category,
+                    risk_score=kw.risk_score,
+                    applies_to=kw.applies_to,
+                    match_condition=kw.match_condition or 'contains'
+                )
+                for kw in keywords
+            ]
+
+        self._risk_keywords_cache = snapshot('risk')
+        self._exclusion_keywords_cache = snapshot('exclusion')
+
+        # Exclusion keywords always use substring matching regardless of match_condition
+        self._risk_keyword_index = self._build_keyword_index(self._risk_keywords_cache)
+        self._exclusion_keyword_index = self._build_keyword_index(self._exclusion_keywords_cache, contains_only=True)
+
+        # One alternation per field lets pandas reject non-matching records column-wide
+        self._risk_subject_re = self._build_keyword_regex(self._risk_keywords_cache, 'subject')
+        self._risk_attachment_re = self._build_keyword_regex(self._risk_keywords_cache, 'attachment')
+
+        logger.info(f"Cached {len(self._risk_keywords_cache)} risk keywords and {len(self._exclusion_keywords_cache)} exclusion keywords")
 
     def _get_cached_keywords(self):
         """Get cached keywords to avoid repeated database queries"""
         if self._risk_keywords_cache is None or self._exclusion_keywords_cache is None:
-            self._risk_keywords_cache = AttachmentKeyword.query.filter_by(
-                is_active=True,
-                keyword_type='risk'
-            ).all()
+            self._load_wordlists()
 
-            self._exclusion_keywords_cache = AttachmentKeyword.query.filter_by(
-                is_active=True,
-                keyword_type='exclusion'
-            ).all()
+        return self._risk_keywords_cache, self._exclusion_keywords_cache
 
-            logger.info(f"Cached {len(self._risk_keywords_cache)} risk keywords and {len(self._exclusion_keywords_cache)} exclusion keywords")
+    def _build_keyword_index(self, keywords, contains_only=False):
+        """Build an Aho-Corasick automaton over substring keywords so each text is scanned once"""
+        if not keywords:
+            return None
 
-        return self._risk_keywords_cache, self._exclusion_keywords_cache
+        # Any match needs the keyword's first character somewhere in the text
+        # (an empty keyword matches everything, so it disables the prefilter)
+        first_chars = None
+        if all(kw.keyword_lower for kw in keywords):
+            first_chars = frozenset(kw.keyword_lower[0] for kw in keywords)
+
+        # Structure-of-arrays columns avoid namedtuple attribute lookups per hit
+        columns = (
+            tuple(kw.keyword_lower for kw in keywords),
+            tuple('contains' if contains_only else kw.match_condition for kw in keywords),
+            tuple(kw.applies_to in ['subject', 'both'] for kw in keywords),
+            tuple(kw.applies_to in ['attachment', 'both'] for kw in keywords)
+        )
+
+        if ahocorasick is None:
+            return KeywordIndex(None, list(range(len(keywords))), first_chars, *columns)
+
+        automaton = ahocorasick.Automaton()
+        direct_indices = []
+
+        for index, kw in enumerate(keywords):
+            if not kw.keyword_lower or (not contains_only and kw.match_condition != 'contains'):
+                # equals/starts_with/ends_with are single comparisons - check them directly
+                direct_indices.append(index)
+                continue
+
+            # Several keywords can share the same lower-cased text
+            indices = automaton.get(kw.keyword_lower, None) or []
+            indices.append(index)
+            automaton.add_word(kw.keyword_lower, indices)
+
+        if len(automaton) == 0:
+            return KeywordIndex(None, direct_indices, first_chars, *columns)
+
+        automaton.make_automaton()
+        return KeywordIndex(automaton, direct_indices, first_chars, *columns)
+
+    def _build_keyword_regex(self, keywords, field):
+        """Compile one alternation over the keywords applying to field, equivalent to _matches_lowered"""
+        templates = {'equals': r'\A{}\Z', 'starts_with': r'\A{}', 'ends_with': r'{}\Z'}
+        alternatives = [
+            templates.get(kw.match_condition, '{}').format(re.escape(kw.keyword_lower))
+            for kw in keywords if kw.applies_to in [field, 'both']
+        ]
+        if not alternatives:
+            return None
+
+        return re.compile('|'.join(f'(?:{alternative})' for alternative in alternatives))
+
+    def _lower_record_fields(self, records, fields=('subject', 'attachments')):
+        """Lower-case the given text fields of all records in one vectorized pass per field"""
+        return {
+            field: pd.Series([getattr(record, field) or '' for record in records], dtype=object).str.lower()
+            for field in fields
+        }
+
+    def _keyword_candidate_mask(self, lowered_fields):
+        """Vectorized prefilter flagging records whose subject or attachments can match a risk keyword"""
+        mask = np.zeros(len(lowered_fields['subject']), dtype=bool)
+        if not mask.size:
+            return mask
+
+        for field, pattern in (('subject', self._risk_subject_re), ('attachments', self._risk_attachment_re)):
+            if pattern is None:
+                continue
+            texts = lowered_fields[field]
+            mask |= ((texts != '') & texts.str.contains(pattern)).to_numpy(dtype=bool)
+
+        return mask
+
+    def _find_keyword_hits(self, text_lower, keywords, keyword_index, contains_only=False):
+        """Return indices of keywords matching lower-cased text, in keyword order"""
+        if keyword_index is None:
+            return [
+                index for index, kw in enumerate(keywords)
+                if self._matches_lowered(text_lower, kw.keyword_lower, 'contains' if contains_only else kw.match_condition)
+            ]
+
+        # Cheap rejection before any scanning: no keyword can start in this text
+        if keyword_index.first_chars is not None and keyword_index.first_chars.isdisjoint(text_lower):
+            return []
 
-    def _analyze_record_keywords(self, record, keywords):
-        """Analyze a single record against a list of keywords"""
+        hits = set()
+        if keyword_index.automaton is not None:
+            hits.update(index for _, indices in keyword_index.automaton.iter(text_lower) for index in indices)
+
+        # match_conditions already has contains_only folded in at build time
+        keyword_lowers = keyword_index.keyword_lowers
+        match_conditions = keyword_index.match_conditions
+        for index in keyword_index.direct_indices:
+            if self._matches_lowered(text_lower, keyword_lowers[index], match_conditions[index]):
+                hits.add(index)
+
+        return sorted(hits)
+
+    def _keyword_applies(self, keywords, keyword_index, field):
+        """Per-keyword flags telling whether each keyword applies to field ('subject' or 'attachment')"""
+        if keyword_index is not None:
+            return keyword_index.applies_subject if field == 'subject' else keyword_index.applies_attachment
+        return tuple(kw.applies_to in [field, 'both'] for kw in keywords)
+
+    def _analyze_record_keywords(self, record, keywords, keyword_index=None, lowered=None):
+        """Analyze a single record against a list of cached keywords"""
         subject_matches = []
         attachment_matches = []
 
         try:
-            # Get text content to analyze
-            subject_text = (record.subject or '').lower()
-            attachment_text = (record.attachments or '').lower()
-
-            for keyword_obj in keywords:
-                keyword = keyword_obj.keyword.lower()
-                applies_to = getattr(keyword_obj, 'applies_to', 'both')
-                match_condition = getattr(keyword_obj, 'match_condition', 'contains')
-
-                # Check for matches in subject and attachments
-                subject_matches = []
-                attachment_matches = []
-
-                for keyword_obj in keywords:
-                    keyword = keyword_obj.keyword.lower()
-                    applies_to = getattr(keyword_obj, 'applies_to', 'both')
-                    match_condition = getattr(keyword_obj, 'match_condition', 'contains')
-
-                    # Check subject
-                    if applies_to in ['subject', 'both'] and subject_text:
-                        if self._matches_condition(subject_text, keyword, match_condition):
-                            subject_matches.append({
-                                'keyword': keyword_obj.keyword,
-                                'category': keyword_obj.category,
-                                'score': keyword_obj.risk_score,
-                                'match_condition': match_condition
-                            })
-
-                    # Check attachments
-                    if applies_to in ['attachment', 'both'] and attachment_text:
-                        if self._matches_condition(attachment_text, keyword, match_condition):
-                            attachment_matches.append({
-                                'keyword': keyword_obj.keyword,
-                                'category': keyword_obj.category,
-                                'score': keyword_obj.risk_score,
-                                'match_condition': match_condition
-                            })
+            # Get text content to analyze (callers may pass pre-lowered subject/attachments)
+            if lowered is not None:
+                subject_text, attachment_text = lowered
+            else:
+                subject_text = (record.subject or '').lower()
+                attachment_text = (record.attachments or '').lower()
+
+            # Check subject
+            if subject_text:
+                applies_subject = self._keyword_applies(keywords, keyword_index, 'subject')
+                for index in self._find_keyword_hits(subject_text, keywords, keyword_index):
+                    if applies_subject[index]:
+                        kw = keywords[index]
+                        subject_matches.append({
+                            'keyword': kw.keyword,
+                            'category': kw.category,
+                            'score': kw.risk_score,
+                            'match_condition': kw.match_condition
+                        })
+
+            # Check attachments
+            if attachment_text:
+                applies_attachment = self._keyword_applies(keywords, keyword_index, 'attachment')
+                for index in self._find_keyword_hits(attachment_text, keywords, keyword_index):
+                    if applies_attachment[index]:
+                        kw = keywords[index]
+                        attachment_matches.append({
+                            'keyword': kw.keyword,
+                            'category': kw.category,
+                            'score': kw.risk_score,
+                            'match_condition': kw.match_condition
+                        })
 
         except Exception as e:
             logger.warning(f"Error analyzing keywords for record {record.record_id}: {str(e)}")
 
         return subject_matches, attachment_matches
 
-    def _analyze_exclusion_keywords_smart(self, record, exclusion_keywords):
+    def _analyze_exclusion_keywords_smart(self, record, exclusion_keywords, keyword_index=None):
         """Smart exclusion keyword analysis for multiple attachments with configurable logic"""
         try:
             result = {
@@ -440,11 +901,10 @@ class DataProcessor:
             subject_text = (record.subject or '').lower()
             subject_matches = []
 
-            for keyword_obj in exclusion_keywords:
-                if keyword_obj.applies_to in ['subject', 'both']:
-                    keyword = keyword_obj.keyword.lower()
-                    if keyword in subject_text:
-                        subject_matches.append(keyword_obj.keyword)
+            applies_subject = self._keyword_applies(exclusion_keywords, keyword_index, 'subject')
+            for index in self._find_keyword_hits(subject_text, exclusion_keywords, keyword_index, contains_only=True):
+                if applies_subject[index]:
+                    subject_matches.append(exclusion_keywords[index].keyword)
 
             # If subject has exclusion keywords, exclude entire email
             if subject_matches:
@@ -457,7 +917,7 @@ class DataProcessor:
             attachments_text = record.attachments or ''
 
             # Handle empty or null attachments
-            if not attachments_text or attachments_text.lower() in ['nan', 'none', 'null', '']:
+            if not attachments_text or attachments_text.lower() in EMPTY_ATTACHMENT_VALUES:
                 return result
 
             # Split attachments by common delimiters
@@ -467,17 +927,16 @@ class DataProcessor:
             safe_attachments = []
 
             # Analyze each attachment individually
+            applies_attachment = self._keyword_applies(exclusion_keywords, keyword_index, 'attachment')
             for attachment in attachment_list:
                 attachment_lower = attachment.lower().strip()
                 has_exclusion = False
                 matched_exclusion_keywords = []
 
-                for keyword_obj in exclusion_keywords:
-                    if keyword_obj.applies_to in ['attachment', 'both']:
-                        keyword = keyword_obj.keyword.lower()
-                        if keyword in attachment_lower:
-                            has_exclusion = True
-                            matched_exclusion_keywords.append(keyword_obj.keyword)
+                for index in self._find_keyword_hits(attachment_lower, exclusion_keywords, keyword_index, contains_only=True):
+                    if applies_attachment[index]:
+                        has_exclusion = True
+                        matched_exclusion_keywords.append(exclusion_keywords[index].keyword)
 
                 attachment_info = {
                     'name': attachment.strip(),
@@ -550,7 +1009,7 @@ class DataProcessor:
         filtered_list = []
         for item in attachment_list:
             item = item.strip()
-            if item and item.lower() not in ['none', 'null', 'nan', '', 'no attachments']:
+            if item and item.lower() not in NON_ATTACHMENT_ITEMS:
                 filtered_list.append(item)
 
         return filtered_list if filtered_list else [attachments_text.strip()]
@@ -583,7 +1042,7 @@ class DataProcessor:
         # Wordlist analysis moved to Stage 5 for better performance and accuracy
         pass
 
-    def _parse_datetime(self, date_value):
+    def _parse_datetime(self, date_value, column=None):
         """Parse datetime with caching and malformed timestamp handling"""
         if pd.isna(date_value) or date_value is None or str(date_value).strip() == '':
             return None
@@ -604,28 +1063,26 @@ class DataProcessor:
                 # Cache was wrong, remove it
                 del self._datetime_format_cache[date_str]
 
+        # Most columns use one format throughout, so try the column's last hit first
+        column_fmt = self._datetime_column_formats.get(column) if column is not None else None
+        if column_fmt:
+            try:
+                return datetime.strptime(date_str, column_fmt)
+            except ValueError:
+                pass
+
         try:
             if isinstance(date_value, str) or isinstance(date_str, str):
                 # Try common formats (prioritize most likely)
-                formats = [
-                    '%Y-%m-%dT%H:%M:%S.%f%z',  # ISO 8601 with milliseconds and timezone: 2025-08-04T23:58:20.543+0200
-                    '%Y-%m-%dT%H:%M:%S.%f',    # ISO 8601 with milliseconds: 2025-08-04T23:58:20.543
-                    '%Y-%m-%dT%H:%M:%S%z',     # ISO 8601 with timezone: 2025-07-21T14:44:19+0200
-                    '%Y-%m-%dT%H:%M:%S',       # ISO 8601 format: 2025-07-21T14:44:19
-                    '%Y-%m-%d %H:%M:%S.%f',    # Standard with milliseconds: 2025-08-04 23:58:20.543
-                    '%Y-%m-%d %H:%M:%S',
-                    '%m/%d/%Y %H:%M:%S', 
-                    '%Y-%m-%d',
-                    '%m/%d/%Y',
-                    '%d/%m/%Y %H:%M:%S',
-                    '%d/%m/%Y'
-                ]
-
-                for fmt in formats:
+                for fmt in DATETIME_FORMATS:
+                    if fmt == column_fmt:
+                        continue
                     try:
                         result = datetime.strptime(date_str, fmt)
                         # Cache successful format for future use
                         self._datetime_format_cache[date_str] = fmt
+                        if column is not None and fmt not in DAYFIRST_DATETIME_FORMATS:
+                            self._datetime_column_formats[column] = fmt
                         return result
                     except ValueError:
                         continue
@@ -640,6 +1097,27 @@ class DataProcessor:
             logger.warning(f"Error parsing datetime {date_value}: {str(e)}")
             return None
 
+    def _parse_datetime_column(self, series):
+        """Parse a date column in one pass, using _parse_datetime only for non-ISO values"""
+        parsed = pd.Series(np.full(len(series), None, dtype=object), index=series.index)
+        pending = pd.Series(True, index=series.index)
+
+        if series.dtype == object:
+            iso_mask = series.str.fullmatch(ISO_DATETIME_PATTERN, na=False)
+            if iso_mask.any():
+                converted = pd.to_datetime(series[iso_mask], format='ISO8601', errors='coerce')
+                converted = converted[converted.notna()]
+                parsed[converted.index] = pd.DatetimeIndex(converted).to_pydatetime()
+                pending[converted.index] = False
+
+        # Remaining values repeat heavily (dates, blanks), so parse each distinct string once
+        remaining = series[pending & series.notna()]
+        if len(remaining):
+            parsed_values = {value: self._parse_datetime(value, series.name) for value in remaining.unique()}
+            parsed[remaining.index] = [parsed_values[value] for value in remaining]
+
+        return parsed
+
     def _sanitize_timestamp(self, timestamp_str):
         """Sanitize malformed timestamps to fix common data quality issues"""
         if not timestamp_str:
@@ -691,50 +1169,51 @@ class DataProcessor:
         try:
             logger.info(f"Starting 9-stage workflow for session {session_id}")
 
+            # Each stage's completion is committed together with the next stage's start;
+            # stage 9 has no successor, so its completion commits on its own
+
             # Stage 2: Exclusion Rules (5-20%)
             self.workflow_manager.start_stage(session_id, 2)
             self._apply_exclusion_rules(session_id)
-            self.workflow_manager.complete_stage(session_id, 2)
+            self.workflow_manager.complete_stage(session_id, 2, commit=False)
 
             # Stage 3: Whitelist Filtering (20-35%)
             self.workflow_manager.start_stage(session_id, 3)
             self._apply_whitelist_filtering(session_id)
-            self.workflow_manager.complete_stage(session_id, 3)
+            self.workflow_manager.complete_stage(session_id, 3, commit=False)
 
             # Stage 4: Security Rules (35-50%)
             self.workflow_manager.start_stage(session_id, 4)
             self._apply_security_rules(session_id)
-            self.workflow_manager.complete_stage(session_id, 4)
+            self.workflow_manager.complete_stage(session_id, 4, commit=False)
 
             # Stage 5: Risk Keywords (50-60%)
             self.workflow_manager.start_stage(session_id, 5)
             self._apply_risk_keywords(session_id)
-            self.workflow_manager.complete_stage(session_id, 5)
+            self.workflow_manager.complete_stage(session_id, 5, commit=False)
 
             # Stage 6: Exclusion Keywords (60-70%)
             self.workflow_manager.start_stage(session_id, 6)
             self._apply_exclusion_keywords(session_id)
-            self.workflow_manager.complete_stage(session_id, 6)
+            self.workflow_manager.complete_stage(session_id, 6, commit=False)
 
             # Stage 7: Flag Matching (70-75%)
             self.workflow_manager.start_stage(session_id, 7)
             self._check_flagged_senders(session_id)
-            self.workflow_manager.complete_stage(session_id, 7)
+            self.workflow_manager.complete_stage(session_id, 7, commit=False)
 
             # Stage 8: ML Analysis (75-85%)
             self.workflow_manager.start_stage(session_id, 8)
             self._apply_ml_analysis(session_id)
-            self.workflow_manager.complete_stage(session_id, 8)
+            self.workflow_manager.complete_stage(session_id, 8, commit=False)
 
             # Stage 9: Case Generation (85-95%)
             self.workflow_manager.start_stage(session_id, 9)
             self._generate_cases(session_id)
             self.workflow_manager.complete_stage(session_id, 9)
 
-            # Stage 10: Final Validation (95-100%)
-            self.workflow_manager.start_stage(session_id, 10)
+            # Final validation runs outside the tracked stages (WORKFLOW_STAGES ends at 9)
             self._final_validation(session_id)
-            self.workflow_manager.complete_stage(session_id, 10)
 
             logger.info(f"10-stage workflow completed for session {session_id}")
 
@@ -792,49 +1271,44 @@ class DataProcessor:
                 logger.info("No active whitelisted senders found")
                 return 0
 
-            # Create a set of whitelisted email addresses for quick lookup (case-insensitive)
-            whitelisted_emails = {sender.email_address.lower() for sender in whitelisted_senders}
+            # Map whitelisted email addresses (case-insensitive) to their entry; first entry wins
+            whitelisted_emails = {}
+            for sender in whitelisted_senders:
+                whitelisted_emails.setdefault(sender.email_address.lower(), sender)
             logger.info(f"Found {len(whitelisted_emails)} active whitelisted senders")
 
-            # Get all records for this session that are not already whitelisted or excluded
-            records = db.session.query(EmailRecord).filter_by(
+            # Only (id, sender) is needed to match; matches are flagged with bulk UPDATEs
+            rows = db.session.query(EmailRecord.id, EmailRecord.sender).filter_by(
                 session_id=session_id,
                 whitelisted=False
             ).filter(EmailRecord.excluded_by_rule.is_(None)).all()
 
-            if not records:
+            if not rows:
                 logger.info("No eligible records found for sender whitelist filtering")
                 return 0
 
-            whitelisted_count = 0
+            matched_ids = []
+            sender_hits = Counter()
+            for record_id, sender in rows:
+                sender_entry = whitelisted_emails.get(sender.lower()) if sender else None
+                if sender_entry is not None:
+                    matched_ids.append(record_id)
+                    sender_hits[sender_entry] += 1
 
-            # Process records in batches for better performance
-            batch_size = 1000
-            for i in range(0, len(records), batch_size):
-                batch_records = records[i:i + batch_size]
+            whitelisted_count = len(matched_ids)
+            if matched_ids:
+                from rule_engine import update_records_by_id
 
-                for record in batch_records:
-                    if record.sender and record.sender.lower() in whitelisted_emails:
-                        # Mark record as whitelisted
-                        record.whitelisted = True
-                        record.case_status = 'Cleared'  # Auto-clear whitelisted records
-                        record.resolved_at = datetime.utcnow()
-
-                        # Update sender whitelist statistics
-                        sender_entry = next(
-                            (s for s in whitelisted_senders if s.email_address.lower() == record.sender.lower()),
-                            None
-                        )
-                        if sender_entry:
-                            sender_entry.times_excluded += 1
-                            sender_entry.last_excluded = datetime.utcnow()
+                # Auto-clear whitelisted records
+                now = datetime.utcnow()
+                update_records_by_id(matched_ids, whitelisted=True, case_status='Cleared', resolved_at=now)
 
-                        whitelisted_count += 1
-                        logger.debug(f"Whitelisted record {record.record_id} from sender {record.sender}")
+                # Update sender whitelist statistics
+                for sender_entry, hits in sender_hits.items():
+                    sender_entry.times_excluded += hits
+                    sender_entry.last_excluded = now
 
-                # Commit batch
                 db.session.commit()
-                logger.info(f"Processed sender whitelist batch {i//batch_size + 1}: {min(i + batch_size, len(records))}/{len(records)} records")
 
             logger.info(f"Sender whitelist filtering completed: {whitelisted_count} records whitelisted")
             return whitelisted_count
@@ -861,8 +1335,8 @@ class DataProcessor:
         try:
             logger.info(f"Starting risk keywords analysis for session {session_id}")
 
-            # Get active risk keywords from AttachmentKeyword model
-            risk_keywords = AttachmentKeyword.query.filter_by(is_active=True, keyword_type='risk').all()
+            # Get active risk keywords from the per-session wordlist snapshot
+            risk_keywords, _ = self._get_cached_keywords()
             if not risk_keywords:
                 logger.warning("No active risk keywords found in AttachmentKeyword table")
                 return
@@ -877,27 +1351,37 @@ class DataProcessor:
 
             risk_matches_count = 0
 
+            # Lower-case subject/attachments once for the prefilter and per-record analysis
+            lowered_fields = self._lower_record_fields(records)
+            lowered_subjects = lowered_fields['subject'].tolist()
+            lowered_attachments = lowered_fields['attachments'].tolist()
+
+            # Vectorized prefilter - records with no possible keyword hit skip per-record analysis
+            candidates = self._keyword_candidate_mask(lowered_fields)
+            logger.info(f"{int(candidates.sum())} records are risk keyword candidates")
+
             # Process records in batches for performance
             batch_size = 1000
             for i in range(0, len(records), batch_size):
                 batch_records = records[i:i + batch_size]
 
-                for record in batch_records:
+                for offset, record in enumerate(batch_records):
+                    position = i + offset
+                    if not candidates[position]:
+                        continue
+
                     # Analyze risk keywords
-                    subject_matches, attachment_matches = self._analyze_record_keywords(record, risk_keywords)
+                    subject_matches, attachment_matches = self._analyze_record_keywords(
+                        record, risk_keywords, self._risk_keyword_index,
+                        lowered=(lowered_subjects[position], lowered_attachments[position])
+                    )
 
                     if subject_matches or attachment_matches:
                         record.wordlist_subject = ', '.join([m['keyword'] for m in subject_matches]) if subject_matches else None
                         record.wordlist_attachment = ', '.join([m['keyword'] for m in attachment_matches]) if attachment_matches else None
 
                         # Calculate risk score based on matched keywords
-                        max_risk_score = 0
-                        for keyword_obj in risk_keywords:
-                            # Check against all matched keywords, considering their match conditions
-                            for match_data in subject_matches + attachment_matches:
-                                if keyword_obj.keyword == match_data['keyword'] and keyword_obj.match_condition == match_data['match_condition']:
-                                    max_risk_score = max(max_risk_score, keyword_obj.risk_score or 1)
-                                    break # Found a match for this keyword_obj, move to next
+                        max_risk_score = max((m['score'] or 1) for m in subject_matches + attachment_matches)
 
                         # Store the highest risk score from matched keywords
                         if max_risk_score > 0:
@@ -921,8 +1405,8 @@ class DataProcessor:
         try:
             logger.info(f"Starting exclusion keywords analysis for session {session_id}")
 
-            # Get active exclusion keywords from AttachmentKeyword model
-            exclusion_keywords = AttachmentKeyword.query.filter_by(is_active=True, keyword_type='exclusion').all()
+            # Get active exclusion keywords from the per-session wordlist snapshot
+            _, exclusion_keywords = self._get_cached_keywords()
             if not exclusion_keywords:
                 logger.warning("No active exclusion keywords found in AttachmentKeyword table")
                 return
@@ -944,7 +1428,7 @@ class DataProcessor:
 
                 for record in batch_records:
                     # Apply smart exclusion keyword logic for multiple attachments
-                    exclusion_result = self._analyze_exclusion_keywords_smart(record, exclusion_keywords)
+                    exclusion_result = self._analyze_exclusion_keywords_smart(record, exclusion_keywords, self._exclusion_keyword_index)
 
                     if exclusion_result['should_exclude']:
                         record.excluded_by_rule = exclusion_result['exclusion_reason']
@@ -1024,8 +1508,12 @@ class DataProcessor:
         """Stage 8: Generate security cases"""
         try:
             # Cases are automatically generated based on risk levels
-            records = EmailRecord.query.filter_by(session_id=session_id).all()
-            case_count = sum(1 for r in records if r.risk_level and r.risk_level != 'Low')
+            # Count them in the database instead of streaming every risk level back
+            case_count = db.session.query(func.count(EmailRecord.id)).filter(
+                EmailRecord.session_id == session_id,
+                EmailRecord.risk_level.isnot(None),
+                EmailRecord.risk_level.notin_(['', 'Low'])
+            ).scalar()
             logger.info(f"Security cases generated: {case_count} cases created")
         except Exception as e:
             logger.error(f"Error in case generation stage: {str(e)}")
@@ -1034,24 +1522,26 @@ class DataProcessor:
     def _final_validation(self, session_id):
         """Stage 9: Final validation and cleanup"""
         try:
-            session = ProcessingSession.query.get(session_id)
-            if not session:
+            # Validate processing results (COUNT(column) skips NULL scores)
+            total_records, analyzed_records = db.session.query(
+                func.count(),
+                func.count(EmailRecord.ml_risk_score)
+            ).filter(EmailRecord.session_id == session_id).one()
+
+            # Update final statistics without loading the session row
+            result = db.session.execute(
+                update(ProcessingSession)
+                .where(ProcessingSession.id == session_id)
+                .values(processing_stats={
+                    'total_records': total_records,
+                    'analyzed_records': analyzed_records,
+                    'analysis_rate': (analyzed_records / total_records * 100) if total_records > 0 else 0,
+                    'workflow_completed': True
+                })
+            )
+            if result.rowcount == 0:
                 raise Exception(f"Session {session_id} not found")
 
-            # Validate processing results
-            total_records = EmailRecord.query.filter_by(session_id=session_id).count()
-            analyzed_records = EmailRecord.query.filter_by(session_id=session_id).filter(
-                EmailRecord.ml_risk_score.isnot(None)
-            ).count()
-
-            # Update final statistics
-            session.processing_stats = {
-                'total_records': total_records,
-                'analyzed_records': analyzed_records,
-                'analysis_rate': (analyzed_records / total_records * 100) if total_records > 0 else 0,
-                'workflow_completed': True
-            }
-
             db.session.commit()
             logger.info(f"Final validation completed: {total_records} total, {analyzed_records} analyzed")
 
@@ -1059,73 +1549,15 @@ class DataProcessor:
             logger.error(f"Error in final validation stage: {str(e)}")
             raise
 
-    def _apply_processing_workflow(self, session_id):
-        """Apply complete processing workflow (Legacy method)"""
-        try:
-            logger.info(f"Starting legacy processing workflow for session {session_id}")
-
-            # Import required engines
-            from rule_engine import RuleEngine
-            from domain_manager import DomainManager
-            from ml_engine import MLEngine
-
-            rule_engine = RuleEngine()
-            domain_manager = DomainManager()
-            ml_engine = MLEngine()
-
-            # Step 1: Apply exclusion rules
-            if not self._is_workflow_step_completed(session_id, 'exclusion_applied'):
-                excluded_count = rule_engine.apply_exclusion_rules(session_id)
-                logger.info(f"Exclusion rules applied: {excluded_count} records excluded")
-                self._mark_workflow_step_completed(session_id, 'exclusion_applied')
-
-            # Step 2: Apply domain whitelist
-            if not self._is_workflow_step_completed(session_id, 'whitelist_applied'):
-                whitelisted_count = domain_manager.apply_whitelist_filtering(session_id)
-                logger.info(f"Domain whitelist applied: {whitelisted_count} records whitelisted")
-                self._mark_workflow_step_completed(session_id, 'whitelist_applied')
-
-            # Step 3: Apply security rules
-            if not self._is_workflow_step_completed(session_id, 'rules_applied'):
-                flagged_count = rule_engine.apply_security_rules(session_id)
-                logger.info(f"Security rules applied: {flagged_count} records flagged")
-                self._mark_workflow_step_completed(session_id, 'rules_applied')
-
-            # Step 4: Apply ML analysis
-            if not self._is_workflow_step_completed(session_id, 'ml_applied'):
-                analyzed_count = ml_engine.analyze_session(session_id)
-                logger.info(f"ML analysis applied: {analyzed_count} records analyzed")
-                self._mark_workflow_step_completed(session_id, 'ml_applied')
-
-        except Exception as e:
-            logger.error(f"Error in processing workflow for session {session_id}: {str(e)}")
-            raise
-
-    def _is_workflow_step_completed(self, session_id, step_name):
-        """Check if a workflow step has been completed"""
-        session = ProcessingSession.query.get(session_id)
-        return getattr(session, step_name, False) if session else False
-
     def _mark_workflow_step_completed(self, session_id, step_name):
-        """Mark a workflow step as completed"""
-        session = ProcessingSession.query.get(session_id)
-        if session:
-            setattr(session, step_name, True)
-            db.session.commit()
-
-    def _log_processing_error(self, session_id, error_type, error_message, record_data=None):
-        """Log processing error to database"""
-        try:
-            error_record = ProcessingError(
-                session_id=session_id,
-                error_type=error_type,
-                error_message=error_message,
-                record_data=record_data
-            )
-            db.session.add(error_record)
-            db.session.commit()
-        except Exception as e:
-            logger.error(f"Failed to log processing error: {str(e)}")
+        """Mark a workflow step as completed with a single UPDATE instead of loading the session"""
+        db.session.execute(
+            update(ProcessingSession)
+            .where(ProcessingSession.id == session_id)
+            .values({step_name: True})
+            .execution_options(synchronize_session='fetch')
+        )
+        db.session.commit()
 
     def get_processing_summary(self, session_id):
         """Get processing summary for a session"""
@@ -1134,19 +1566,19 @@ class DataProcessor:
             if not session:
                 return None
 
-            total_records = EmailRecord.query.filter_by(session_id=session_id).count()
-            excluded_records = EmailRecord.query.filter(
-                EmailRecord.session_id == session_id,
-                EmailRecord.excluded_by_rule.isnot(None)
-            ).count()
-            whitelisted_records = EmailRecord.query.filter_by(
-                session_id=session_id,
-                whitelisted=True
-            ).count()
-            analyzed_records = EmailRecord.query.filter(
-                EmailRecord.session_id == session_id,
-                EmailRecord.ml_risk_score.isnot(None)
-            ).count()
+            # One pass over the session's records with conditional aggregates
+            # instead of a separate COUNT query per figure
+            counts = db.session.query(
+                func.count().label('total'),
+                func.sum(case((EmailRecord.excluded_by_rule.isnot(None), 1), else_=0)).label('excluded'),
+                func.sum(case((EmailRecord.whitelisted == True, 1), else_=0)).label('whitelisted'),
+                func.sum(case((EmailRecord.ml_risk_score.isnot(None), 1), else_=0)).label('analyzed')
+            ).filter(EmailRecord.session_id == session_id).one()
+
+            total_records = counts.total or 0
+            excluded_records = counts.excluded or 0
+            whitelisted_records = counts.whitelisted or 0
+            analyzed_records = counts.analyzed or 0
 
             return {
                 'session_id': session_id,
@@ -53,45 +53,44 @@ class DomainManager:
                 logger.warning("No active whitelist domains found - no filtering will be applied")
                 return 0
 
-            # Get records to process (not already whitelisted and not excluded)
-            records = EmailRecord.query.filter_by(session_id=session_id).filter(
+            # Records to process (not already whitelisted and not excluded); only the
+            # record-by-record fallback below needs the rows themselves
+            eligible_records = EmailRecord.query.filter_by(session_id=session_id).filter(
                 db.or_(EmailRecord.whitelisted.is_(None), EmailRecord.whitelisted == False)
             ).filter(
                 db.or_(EmailRecord.excluded_by_rule.is_(None), EmailRecord.excluded_by_rule == '')
-            ).all()
+            )
+            total_records = eligible_records.count()
 
-            logger.info(f"Processing {len(records)} non-excluded, non-whitelisted records for whitelist filtering")
+            logger.info(f"Processing {total_records} non-excluded, non-whitelisted records for whitelist filtering")
 
             whitelisted_count = 0
             batch_count = 0
             
             # Ultra-fast SQL-based bulk update for performance
-            total_records = len(records)
             logger.info(f"Starting fast SQL-based whitelist processing for {total_records} records")
             
             # Use SQL bulk updates for maximum performance
             try:
-                from sqlalchemy import text
+                from sqlalchemy import text, bindparam
                 
-                for whitelist_domain in whitelist_set:
-                    # Bulk update all matching records at once using SQL
-                    sql_query = text("""
-                        UPDATE email_records 
-                        SET whitelisted = true, case_status = 'Whitelisted'
-                        WHERE session_id = :session_id 
-                        AND LOWER(recipients_email_domain) = :domain
-                        AND (whitelisted IS NULL OR whitelisted = false)
-                    """)
-                    
+                # One UPDATE matches every whitelisted domain at once (IN list batched
+                # to stay under SQLite's bound-parameter limit)
+                sql_query = text("""
+                    UPDATE email_records 
+                    SET whitelisted = true, case_status = 'Whitelisted'
+                    WHERE session_id = :session_id 
+                    AND LOWER(recipients_email_domain) IN :domains
+                    AND (whitelisted IS NULL OR whitelisted = false)
+                """).bindparams(bindparam('domains', expanding=True))
+                
+                domains = sorted(whitelist_set)
+                for start in range(0, len(domains), 900):
                     result = db.session.execute(sql_query, {
                         'session_id': session_id,
-                        'domain': whitelist_domain.lower()
+                        'domains': domains[start:start + 900]
                     })
-                    
-                    updated_count = result.rowcount
-                    if updated_count > 0:
-                        whitelisted_count += updated_count
-                        logger.info(f"Bulk whitelisted {updated_count} records for domain: {whitelist_domain}")
+                    whitelisted_count += result.rowcount
                 
                 logger.info(f"Fast whitelist processing completed: {whitelisted_count} total records whitelisted")
                 
@@ -99,7 +98,8 @@ class DomainManager:
                 logger.warning(f"Bulk SQL update failed, falling back to record-by-record: {str(bulk_error)}")
                 
                 # Fallback to simpler record processing if SQL fails
-                for i, record in enumerate(records[:1000]):  # Limit to first 1000 for performance
+                records = eligible_records.limit(1000).all()  # Limit to first 1000 for performance
+                for i, record in enumerate(records):
                     if not record.recipients_email_domain:
                         continue
 
@@ -141,6 +141,9 @@ def create_complete_schema(cursor):
             FOREIGN KEY (session_id) REFERENCES processing_sessions (id)
         )
     """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS ix_email_records_session_summary ON email_records (session_id, whitelisted, excluded_by_rule, ml_risk_score)
+    """)
     
     # Rules
     cursor.execute("""
@@ -5,7 +5,7 @@ Database migration script to add chunk tracking columns
 """
 
 from app import app, db
-from models import ProcessingSession
+from models import ProcessingSession, EmailRecord
 import sqlite3
 import os
 
@@ -38,6 +38,12 @@ def migrate_database():
             cursor.execute('ALTER TABLE processing_sessions ADD COLUMN total_chunks INTEGER DEFAULT 0')
             print("✓ Added total_chunks column")
         
+        # Session-scoped index used by every per-session stage query
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='email_records'")
+        if cursor.fetchone():
+            cursor.execute('CREATE INDEX IF NOT EXISTS ix_email_records_session_summary ON email_records (session_id, whitelisted, excluded_by_rule, ml_risk_score)')
+            print("✓ Ensured ix_email_records_session_summary index")
+        
         # Commit changes
         conn.commit()
         conn.close()
@@ -50,5 +56,13 @@ def migrate_database():
             conn.close()
         raise
 
+def migrate_configured_database():
+    """Add missing indexes to the database DATABASE_URL points at (PostgreSQL included)"""
+    with app.app_context():
+        for index in EmailRecord.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+            print(f"✓ Ensured {index.name} index")
+
 if __name__ == "__main__":
     migrate_database()
+    migrate_configured_database()
@@ -57,7 +57,7 @@ class MLEngine:
                     EmailRecord.excluded_by_rule.is_(None),
                     db.or_(EmailRecord.whitelisted.is_(None), EmailRecord.whitelisted == False),
                     db.or_(EmailRecord.risk_level.is_(None), EmailRecord.risk_level == '')
-                ).limit(max_records).all()
+                ).order_by(EmailRecord.id).limit(max_records).all()
                 
                 # Apply basic risk scoring to remaining records without ML
                 remaining_records = EmailRecord.query.filter(
@@ -65,7 +65,7 @@ class MLEngine:
                     EmailRecord.excluded_by_rule.is_(None),
                     db.or_(EmailRecord.whitelisted.is_(None), EmailRecord.whitelisted == False),
                     db.or_(EmailRecord.risk_level.is_(None), EmailRecord.risk_level == '')
-                ).offset(max_records).all()
+                ).order_by(EmailRecord.id).offset(max_records).all()
                 
                 # Quick basic risk assignment for remaining records
                 for record in remaining_records:
@@ -84,7 +84,7 @@ class MLEngine:
                     EmailRecord.excluded_by_rule.is_(None),
                     db.or_(EmailRecord.whitelisted.is_(None), EmailRecord.whitelisted == False),
                     db.or_(EmailRecord.risk_level.is_(None), EmailRecord.risk_level == '')
-                ).limit(max_records).all()
+                ).order_by(EmailRecord.id).limit(max_records).all()
             
             logger.info(f"Processing {len(records)} records for full ML analysis (fast_mode={self.fast_mode})")
 
@@ -221,16 +221,16 @@ class MLEngine:
         """Engineer features for ML analysis"""
         features = []
 
-        for _, row in df.iterrows():
+        for row in df.itertuples(index=False):
             feature_vector = []
 
             # Text-based features
-            subject_len = len(row['subject'])
-            has_attachments = 1 if row['attachments'] else 0
-            has_wordlist_match = self._check_custom_wordlist_match(row['subject'], row['attachments'])
+            subject_len = len(row.subject)
+            has_attachments = 1 if row.attachments else 0
+            has_wordlist_match = self._check_custom_wordlist_match(row.subject, row.attachments)
 
             # Domain features
-            domain = row['recipients_email_domain'].lower()
+            domain = row.recipients_email_domain.lower()
             is_external = 1 if domain and not any(corp in domain for corp in ['company.com', 'corp.com']) else 0
             is_public_domain = 1 if any(pub in domain for pub in ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com']) else 0
 
@@ -239,21 +239,21 @@ class MLEngine:
             is_after_hours = 0
             try:
                 # Basic time analysis - can be enhanced
-                if 'weekend' in row['time'].lower():
+                if 'weekend' in row.time.lower():
                     is_weekend = 1
-                if any(hour in row['time'] for hour in ['22:', '23:', '00:', '01:', '02:', '03:', '04:', '05:']):
+                if any(hour in row.time for hour in ['22:', '23:', '00:', '01:', '02:', '03:', '04:', '05:']):
                     is_after_hours = 1
             except:
                 pass
 
             # Leaver status
-            is_leaver = 1 if row['leaver'].lower() in ['yes', 'true', '1'] else 0
+            is_leaver = 1 if row.leaver.lower() in ['yes', 'true', '1'] else 0
 
             # Attachment risk features
-            attachment_risk = self._calculate_attachment_risk(row['attachments'])
+            attachment_risk = self._calculate_attachment_risk(row.attachments)
 
             # Justification sentiment (basic)
-            justification_len = len(row['justification'])
+            justification_len = len(row.justification)
             has_justification = 1 if justification_len > 0 else 0
 
             feature_vector = [
@@ -436,7 +436,7 @@ class MLEngine:
         """Calculate comprehensive risk scores"""
         risk_scores = []
 
-        for i, (_, row) in enumerate(df.iterrows()):
+        for i, row in enumerate(df.itertuples(index=False)):
             base_risk = 0.0
 
             # Anomaly contribution (40% of score)
@@ -446,28 +446,28 @@ class MLEngine:
             rule_risk = 0.0
 
             # High-risk indicators
-            if row['leaver'].lower() in ['yes', 'true', '1']:
+            if row.leaver.lower() in ['yes', 'true', '1']:
                 rule_risk += 0.3
 
             # External domain risk
-            domain = row['recipients_email_domain'].lower()
+            domain = row.recipients_email_domain.lower()
             if any(pub in domain for pub in ['gmail.com', 'yahoo.com', 'hotmail.com']):
                 rule_risk += 0.2
 
             # Attachment risk
-            attachment_risk = self._calculate_attachment_risk(row['attachments'])
+            attachment_risk = self._calculate_attachment_risk(row.attachments)
             rule_risk += attachment_risk * 0.3
 
             # Custom wordlist matches
-            wordlist_risk = self._calculate_wordlist_risk(row['subject'], row['attachments'])
+            wordlist_risk = self._calculate_wordlist_risk(row.subject, row.attachments)
             rule_risk += wordlist_risk
 
             # Time-based risk (basic implementation)
-            if 'weekend' in row['time'].lower():
+            if 'weekend' in row.time.lower():
                 rule_risk += 0.1
 
             # Justification analysis (basic sentiment)
-            justification = row['justification'].lower()
+            justification = row.justification.lower()
             suspicious_justification_terms = ['urgent', 'confidential', 'personal', 'mistake', 'wrong']
             if any(term in justification for term in suspicious_justification_terms):
                 rule_risk += 0.1
@@ -37,6 +37,10 @@ class ProcessingSession(db.Model):
 
 class EmailRecord(db.Model):
     __tablename__ = 'email_records'
+    __table_args__ = (
+        # session_id has no other index and every stage filters on it (plus whitelisted/excluded_by_rule)
+        db.Index('ix_email_records_session_summary', 'session_id', 'whitelisted', 'excluded_by_rule', 'ml_risk_score'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     session_id = db.Column(db.String(36), db.ForeignKey('processing_sessions.id'), nullable=False)
@@ -23,6 +23,12 @@ class PerformanceConfig:
         
         # Database settings - Maximum performance commits
         self.batch_commit_size = int(os.environ.get('EMAIL_GUARDIAN_BATCH_SIZE', '1000' if self.fast_mode else '50'))
+        # Count CSV rows by scanning newlines; disable for files with multi-line quoted fields
+        self.fast_row_count = os.environ.get('EMAIL_GUARDIAN_FAST_ROW_COUNT', 'true').lower() == 'true'
+        # Minimum seconds between ingestion progress commits (the final chunk always commits)
+        self.progress_commit_seconds = float(os.environ.get('EMAIL_GUARDIAN_PROGRESS_COMMIT_SECONDS', '2'))
+        # Parallel ingestion writers (each on its own connection; SQLite always uses one)
+        self.ingest_workers = int(os.environ.get('EMAIL_GUARDIAN_INGEST_WORKERS', '4' if self.fast_mode else '1'))
     
     def get_config_summary(self):
         """Return configuration summary for logging"""
@@ -34,7 +40,10 @@ class PerformanceConfig:
             'progress_update_interval': self.progress_update_interval,
             'tfidf_max_features': self.tfidf_max_features,
             'skip_advanced_analysis': self.skip_advanced_analysis,
-            'batch_commit_size': self.batch_commit_size
+            'batch_commit_size': self.batch_commit_size,
+            'fast_row_count': self.fast_row_count,
+            'progress_commit_seconds': self.progress_commit_seconds,
+            'ingest_workers': self.ingest_workers
         }
 
 # Global configuration instance
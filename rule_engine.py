@@ -2,11 +2,45 @@ import json
 import re
 import logging
 from datetime import datetime
+import numpy as np
+from sqlalchemy import update
 from models import Rule, EmailRecord
 from app import db
 
+try:
+    import orjson
+except ImportError:
+    # Optional accelerator - fall back to the standard library encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Ids per bulk UPDATE ... WHERE id IN (...), kept under SQLite's bound-parameter limit
+RECORD_UPDATE_BATCH = 900
+
+# Common CSV representations of empty/none values, compared lower-cased
+EMPTY_VALUES = frozenset(['', 'none', 'null', 'n/a', 'na', 'nil'])
+
+
+def _dumps_matches(matches):
+    """Serialize rule match lists for EmailRecord.rule_matches (TEXT column)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(matches).decode()
+        except TypeError:
+            pass  # Values orjson cannot encode go through json below
+    return json.dumps(matches)
+
+def update_records_by_id(record_ids, **values):
+    """Set the same column values on many EmailRecords with batched UPDATE statements"""
+    for start in range(0, len(record_ids), RECORD_UPDATE_BATCH):
+        db.session.execute(
+            update(EmailRecord)
+            .where(EmailRecord.id.in_(record_ids[start:start + RECORD_UPDATE_BATCH]))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
 class RuleEngine:
     """Business rules and exclusion engine for email processing"""
     
@@ -46,24 +80,23 @@ class RuleEngine:
             logger.info(f"Processing {len(records)} records for exclusion rules")
             excluded_count = 0
             
-            for record in records:
-                if record.excluded_by_rule:  # Already excluded
-                    continue
+            # Evaluate each rule across the whole session at once; the first
+            # matching rule (priority order) excludes a still-pending record
+            pending = np.array([not record.excluded_by_rule for record in records], dtype=bool)
+            field_values = {}
+            
+            for rule in exclusion_rules:
+                if not pending.any():
+                    break
                 
-                # Log sample record data for debugging
-                if excluded_count < 5:  # Only log first few records
-                    logger.info(f"Sample record {record.record_id}: leaver='{record.leaver}', attachments='{record.attachments}', wordlist_attachment='{record.wordlist_attachment}'")
+                matched = pending & self._rule_mask(records, rule, field_values)
+                update_records_by_id([records[index].id for index in np.flatnonzero(matched)], excluded_by_rule=rule.name)
                 
-                for rule in exclusion_rules:
-                    try:
-                        if self._evaluate_rule_conditions(record, rule):
-                            record.excluded_by_rule = rule.name
-                            excluded_count += 1
-                            logger.info(f"Record {record.record_id} excluded by rule: {rule.name}")
-                            break  # First matching rule excludes the record
-                    except Exception as e:
-                        logger.error(f"Error evaluating exclusion rule '{rule.name}': {str(e)}")
-                        continue
+                rule_excluded = int(matched.sum())
+                if rule_excluded:
+                    logger.info(f"Rule '{rule.name}' excluded {rule_excluded} records")
+                excluded_count += rule_excluded
+                pending &= ~matched
             
             db.session.commit()
             logger.info(f"Exclusion rules applied: {excluded_count} records excluded")
@@ -103,43 +136,52 @@ class RuleEngine:
             
             logger.info(f"Evaluating {len(records)} records against security rules")
             
-            rule_matches = []
-            matches_found = 0
+            # Log sample record data for debugging
+            for record in records[:5]:
+                logger.info(f"Sample record {record.record_id}: leaver='{record.leaver}', attachments='{record.attachments}', wordlist_attachment='{record.wordlist_attachment}'")
             
-            for record in records:
-                matched_rules = []
-                
-                # Log sample record data for debugging
-                if matches_found < 5:  # Only log first few records
-                    logger.info(f"Sample record {record.record_id}: leaver='{record.leaver}', attachments='{record.attachments}', wordlist_attachment='{record.wordlist_attachment}'")
-                
-                for rule in security_rules:
-                    try:
-                        if self._evaluate_rule_conditions(record, rule):
-                            logger.info(f"SECURITY MATCH: Rule '{rule.name}' matched record {record.record_id}")
-                            matched_rules.append({
-                                'rule_id': rule.id,
-                                'rule_name': rule.name,
-                                'description': rule.description,
-                                'priority': rule.priority,
-                                'actions': rule.actions
-                            })
-                            
-                            # Apply rule actions
-                            self._apply_rule_actions(record, rule)
-                            matches_found += 1
-                    except Exception as e:
-                        logger.error(f"Error evaluating rule '{rule.name}': {str(e)}")
+            # Evaluate each rule across the whole session at once; a rule's actions
+            # run before the next rule is evaluated, as they did per record
+            matched_by_record = {}
+            field_values = {}
+            
+            for rule in security_rules:
+                try:
+                    matched = np.flatnonzero(self._rule_mask(records, rule, field_values))
+                    if not len(matched):
                         continue
-                
-                if matched_rules:
-                    record.rule_matches = json.dumps(matched_rules)
-                    rule_matches.extend(matched_rules)
                     
-                    # Mark as Critical if any security rule matches
-                    if not record.risk_level or record.risk_level != 'Critical':
-                        record.risk_level = 'Critical'
-                        record.ml_risk_score = max(record.ml_risk_score or 0, 0.9)
+                    logger.info(f"SECURITY MATCH: Rule '{rule.name}' matched {len(matched)} records")
+                    rule_match = {
+                        'rule_id': rule.id,
+                        'rule_name': rule.name,
+                        'description': rule.description,
+                        'priority': rule.priority,
+                        'actions': rule.actions
+                    }
+                    for index in matched:
+                        matched_by_record.setdefault(index, []).append(rule_match)
+                        
+                        # Apply rule actions
+                        self._apply_rule_actions(records[index], rule)
+                    
+                    if rule.actions:
+                        field_values.clear()  # Actions may have changed fields later rules read
+                except Exception as e:
+                    logger.error(f"Error evaluating rule '{rule.name}': {str(e)}")
+                    continue
+            
+            rule_matches = []
+            for index in sorted(matched_by_record):
+                record = records[index]
+                matched_rules = matched_by_record[index]
+                record.rule_matches = _dumps_matches(matched_rules)
+                rule_matches.extend(matched_rules)
+                
+                # Mark as Critical if any security rule matches
+                if not record.risk_level or record.risk_level != 'Critical':
+                    record.risk_level = 'Critical'
+                    record.ml_risk_score = max(record.ml_risk_score or 0, 0.9)
             
             db.session.commit()
             logger.info(f"Security rules applied: {len(rule_matches)} rule matches found")
@@ -207,6 +249,94 @@ class RuleEngine:
             logger.error(f"Error evaluating rule conditions for rule {rule.name}: {str(e)}")
             return False
     
+    def _rule_mask(self, records, rule, field_values=None):
+        """Evaluate rule conditions against many records, returning a boolean array.
+
+        Mirrors _evaluate_rule_conditions, but each single condition is
+        evaluated once per distinct field value instead of once per record.
+        field_values caches record field lists between rules.
+        """
+        no_match = np.zeros(len(records), dtype=bool)
+        if field_values is None:
+            field_values = {}
+        
+        try:
+            conditions = rule.conditions
+            if not conditions:
+                return no_match
+            
+            if isinstance(conditions, str):
+                try:
+                    conditions = json.loads(conditions)
+                except json.JSONDecodeError:
+                    logger.error(f"Invalid JSON conditions for rule '{rule.name}': {conditions}")
+                    return no_match
+            elif isinstance(conditions, list) and len(conditions) == 0:
+                return no_match
+            
+            if isinstance(conditions, dict):
+                if 'logic' in conditions and 'conditions' in conditions:
+                    return self._complex_conditions_mask(records, conditions, field_values)
+                return self._single_condition_mask(records, conditions, field_values)
+            elif isinstance(conditions, list):
+                mask = np.ones(len(records), dtype=bool)
+                for cond in conditions:
+                    mask &= self._single_condition_mask(records, cond, field_values)
+                return mask
+            
+            logger.warning(f"Unknown condition format for rule '{rule.name}': {type(conditions)}")
+            return no_match
+            
+        except Exception as e:
+            logger.error(f"Error evaluating rule conditions for rule {rule.name}: {str(e)}")
+            return no_match
+    
+    def _complex_conditions_mask(self, records, conditions, field_values):
+        """Batch counterpart of _evaluate_complex_conditions"""
+        logic = conditions.get('logic', 'AND').upper()
+        condition_list = conditions.get('conditions', [])
+        
+        if not condition_list:
+            return np.zeros(len(records), dtype=bool)
+        
+        masks = []
+        for condition in condition_list:
+            if isinstance(condition, dict) and 'logic' in condition:
+                masks.append(self._complex_conditions_mask(records, condition, field_values))
+            else:
+                masks.append(self._single_condition_mask(records, condition, field_values))
+        
+        if logic == 'OR':
+            return np.logical_or.reduce(masks)
+        return np.logical_and.reduce(masks)
+    
+    def _single_condition_mask(self, records, condition, field_values):
+        """Batch counterpart of _evaluate_single_condition"""
+        try:
+            field = condition.get('field')
+            operator = condition.get('operator')
+            value = condition.get('value')
+            negate = condition.get('negate', False)
+            
+            if not field or not operator:
+                return np.zeros(len(records), dtype=bool)
+            
+            values = field_values.get(field)
+            if values is None:
+                values = [self._get_field_value(record, field) for record in records]
+                field_values[field] = values
+            
+            results = {}
+            for record_value in set(values):
+                results[record_value] = bool(self._apply_operator_with_regex(record_value, operator, value))
+            
+            mask = np.fromiter((results[v] for v in values), dtype=bool, count=len(values))
+            return ~mask if negate else mask
+            
+        except Exception as e:
+            logger.error(f"Error evaluating single condition: {str(e)}")
+            return np.zeros(len(records), dtype=bool)
+    
     def _evaluate_rule_conditions_with_parsed(self, record, rule, conditions):
         """Helper method for parsed JSON conditions"""
         if isinstance(conditions, dict):
@@ -282,10 +412,9 @@ class RuleEngine:
             condition_str = str(condition_value).strip() if condition_value is not None else ""
             
             # Handle common CSV representations of empty/none values
-            empty_values = ['', 'none', 'null', 'n/a', 'na', 'nil']
-            if record_str.lower() in empty_values:
+            if record_str.lower() in EMPTY_VALUES:
                 record_str = ""
-            if condition_str.lower() in empty_values:
+            if condition_str.lower() in EMPTY_VALUES:
                 condition_str = ""
             
             logger.info(f"OPERATOR DEBUG - Comparing: '{record_str}' {operator} '{condition_str}'")
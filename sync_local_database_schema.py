@@ -66,6 +66,13 @@ def sync_database_schema():
             if check_and_add_column(cursor, 'email_records', column_name, column_type, default_value):
                 changes_made += 1
         
+        # Session-scoped summary index (covers the per-session count queries)
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name='ix_email_records_session_summary'")
+        if not cursor.fetchone():
+            print("➕ Creating index ix_email_records_session_summary on email_records")
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_email_records_session_summary ON email_records (session_id, whitelisted, excluded_by_rule, ml_risk_score)")
+            changes_made += 1
+        
         # Check processing_sessions table
         print("\n⚙️ Checking processing_sessions table...")
         session_columns = [
@@ -228,8 +228,8 @@ class WorkflowManager:
             logger.error(f"Error updating stage progress for session {session_id}: {str(e)}")
             return False
 
-    def complete_stage(self, session_id, stage_number):
-        """Complete a workflow stage with improved error handling"""
+    def complete_stage(self, session_id, stage_number, commit=True):
+        """Complete a workflow stage; with commit=False the change rides on the caller's next commit"""
         try:
             session = self._get_session_with_retry(session_id)
             if not session:
@@ -258,7 +258,8 @@ class WorkflowManager:
                 session.status = 'completed'
                 session.stage_progress = 100.0
 
-            self._commit_with_retry()
+            if commit:
+                self._commit_with_retry()
 
             logger.info(f"Completed stage {stage_number} ({self.WORKFLOW_STAGES[stage_number]['name']}) for session {session_id}")
             return True